@@ -11,9 +11,10 @@ import json
 import uuid
 import hashlib
 import platform
-import requests
 import yaml
-from PIL import Image, ImageDraw, ImageFont
+from eink_generator import update_eink_display
+from text_render import render_text_image
+from utils import get_session
 
 if platform.system() != "Darwin":
     from display import display_single_image
@@ -42,7 +43,7 @@ def call_gemini_api(prompt, api_key, temperature=1.5):
         "generationConfig": {"temperature": temperature}
     }
 
-    response = requests.post(url, headers=headers, json=data, timeout=30)
+    response = get_session().post(url, headers=headers, json=data, timeout=30)
 
     if response.status_code == 200:
         result = response.json()
@@ -67,7 +68,7 @@ def call_openai_api(prompt, api_key, model="gpt-3.5-turbo", temperature=1.2):
         "temperature": temperature
     }
 
-    response = requests.post(url, headers=headers, json=data, timeout=30)
+    response = get_session().post(url, headers=headers, json=data, timeout=30)
 
     if response.status_code == 200:
         result = response.json()
@@ -76,13 +77,10 @@ def call_openai_api(prompt, api_key, model="gpt-3.5-turbo", temperature=1.2):
         raise RuntimeError(f"API Error: {response.status_code}, {response.text}")
 
 
-def generate_business_idea(config):
-    """Generate a unique business idea using the configured API."""
-    seed = generate_unique_seed()
-
-    prompt = f"""Seed: {seed}
-
-{config.get('prompt', '''Generate a unique, creative money-making business idea. Include:
+# Static instructions kept as a module constant so the prompt prefix is
+# byte-identical across calls — providers cache shared prefixes, so only
+# the short variable suffix is recomputed.
+DEFAULT_IDEA_PROMPT = """Generate a unique, creative money-making business idea. Include:
 
 1. IDEA: A catchy one-line business name/concept
 2. WHAT: What the business does (1-2 sentences)
@@ -90,7 +88,17 @@ def generate_business_idea(config):
 4. START: How to start with minimal investment (1 sentence)
 
 Keep it concise for an e-ink display. Be creative and practical.
-Format it cleanly without markdown symbols.''')}"""
+Format it cleanly without markdown symbols."""
+
+
+def generate_business_idea(config):
+    """Generate a unique business idea using the configured API."""
+    seed = generate_unique_seed()
+
+    # Static prefix first, variable seed last
+    prompt = f"""{config.get('prompt', DEFAULT_IDEA_PROMPT)}
+
+Seed: {seed}"""
 
     api_provider = config.get("api_provider", "gemini").lower()
     temperature = config.get("temperature", 1.5)
@@ -104,96 +112,33 @@ Format it cleanly without markdown symbols.''')}"""
         return call_gemini_api(prompt, api_key, temperature)
 
 
-def wrap_text(text, font, draw, max_width):
-    """Wrap text to fit within max_width."""
-    words = text.split()
-    if not words:
-        return ""
-
-    lines = []
-    current_line = words[0]
-
-    for word in words[1:]:
-        test_line = current_line + " " + word
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        if bbox[2] - bbox[0] <= max_width:
-            current_line = test_line
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
-
-    return "\n".join(lines)
-
-
 def generate_display_image(text, config):
     """Generate an image with the business idea for e-ink display."""
-    width = config.get("width", 800)
-    height = config.get("height", 480)
-    bg_color = config.get("background_color", "white")
-    text_color = config.get("text_color", "black")
-    max_font_size = config.get("max_font_size", 40)
-    min_font_size = config.get("min_font_size", 14)
-    margin = config.get("margin", 20)
-
-    # Select font based on platform
-    if platform.system() == "Darwin":
-        font_path = "/Library/Fonts/Arial.ttf"
-    else:
-        font_path = "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf"
-
-    font_path = config.get("font_path", font_path)
-
-    img = Image.new("RGB", (width, height), color=bg_color)
-    draw = ImageDraw.Draw(img)
+    return render_text_image(text, config)
 
-    # Find largest font size that fits
-    font_size = max_font_size
-    while font_size >= min_font_size:
-        font = ImageFont.truetype(font_path, font_size)
-        wrapped = wrap_text(text, font, draw, width - 2 * margin)
-        bbox = draw.multiline_textbbox((0, 0), wrapped, font=font)
-        text_height = bbox[3] - bbox[1]
-        text_width = bbox[2] - bbox[0]
 
-        if text_height <= height - 2 * margin and text_width <= width - 2 * margin:
-            break
-        font_size -= 2
+def save_idea_history(idea, history_file="business_ideas_history.jsonl"):
+    """Append the generated idea to history to track uniqueness.
 
-    # Use minimum font size if nothing fits
-    if font_size < min_font_size:
-        font_size = min_font_size
-        font = ImageFont.truetype(font_path, font_size)
-        wrapped = wrap_text(text, font, draw, width - 2 * margin)
-        bbox = draw.multiline_textbbox((0, 0), wrapped, font=font)
-        text_height = bbox[3] - bbox[1]
-        text_width = bbox[2] - bbox[0]
+    History is JSONL — one idea per line — so each run is an O(1) append
+    instead of a full read-modify-rewrite of the whole file.
+    """
+    with open(history_file, "a") as f:
+        record = {"id": generate_unique_seed(), "idea": idea}
+        f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    _compact_history(history_file)
 
-    # Center the text
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2
-    draw.multiline_text((x, y), wrapped, fill=text_color, font=font, align="left")
 
-    return img
-
-
-def save_idea_history(idea, history_file="business_ideas_history.json"):
-    """Save generated idea to history to track uniqueness."""
-    history = []
-    if os.path.exists(history_file):
-        with open(history_file, "r") as f:
-            history = json.load(f)
-
-    history.append({
-        "id": generate_unique_seed(),
-        "idea": idea
-    })
-
-    # Keep only last 100 ideas
-    history = history[-100:]
-
-    with open(history_file, "w") as f:
-        json.dump(history, f, indent=2)
+def _compact_history(history_file, keep=100, slack=50):
+    """Trim history to the last `keep` lines once it has grown `slack` past that."""
+    with open(history_file, "r") as f:
+        lines = f.readlines()
+    if len(lines) <= keep + slack:
+        return
+    tmp_file = history_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        f.writelines(lines[-keep:])
+    os.replace(tmp_file, history_file)
 
 
 def main():
@@ -214,19 +159,22 @@ def main():
     print("=" * 50 + "\n")
 
     # Save to history
-    history_file = config.get("history_file", "business_ideas_history.json")
+    history_file = config.get("history_file", "business_ideas_history.jsonl")
     save_idea_history(idea, history_file)
 
-    # Generate display image
+    # Generate display image; skip the slow e-ink refresh when unchanged
     img = generate_display_image(idea, config)
     output_path = config.get("output_path", "business_idea.bmp")
-    img.save(output_path)
+    updated = update_eink_display(img, output_path)
     print(f"Image saved to: {output_path}")
 
     # Display on e-ink if not on macOS
     if platform.system() != "Darwin":
-        display_single_image(output_path)
-        print("Displayed on e-ink screen.")
+        if updated:
+            display_single_image(img)  # in-memory; skips the BMP re-decode
+            print("Displayed on e-ink screen.")
+        else:
+            print("Image unchanged; skipping e-ink refresh.")
     else:
         print("Skipping e-ink display (running on macOS)")
 
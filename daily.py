@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Daily Runner for E-Ink Display Flows
+
+Drives the business idea, saint of the day, and special weather message
+fetches from one entrypoint so their network calls overlap instead of
+running back-to-back from cron. The fetch phase drops from the sum of
+the three request latencies to roughly the slowest one; rendering and
+the e-ink refresh stay serialized because the panel is a single device.
+"""
+
+import platform
+from concurrent.futures import ThreadPoolExecutor
+
+import business_idea_generator
+import saint_of_the_day
+import special_weather_message
+from eink_generator import update_eink_display
+
+if platform.system() != "Darwin":
+    from display import display_single_image
+
+
+def fetch_all(idea_config, saint_config):
+    """Run the three network fetches concurrently on a shared session.
+
+    The worker threads all post through utils.get_session(), so the
+    pooled connections are reused across providers where possible.
+    Failures are isolated per fetch — one provider erroring returns None
+    for that slot while the others proceed, matching the independence
+    the separate cron invocations used to give.
+    """
+    def _safe(name, future):
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Fetch failed for {name}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        idea_future = pool.submit(
+            business_idea_generator.generate_business_idea, idea_config)
+        saint_future = pool.submit(
+            saint_of_the_day.get_saint_of_the_day, saint_config)
+        weather_future = pool.submit(
+            special_weather_message.get_special_weather_messages)
+        return (_safe("business idea", idea_future),
+                _safe("saint of the day", saint_future),
+                _safe("weather messages", weather_future))
+
+
+def render_and_display(text, config, generate_image, default_output):
+    """Render one flow's image and refresh the panel if it changed."""
+    img = generate_image(text, config)
+    output_path = config.get("output_path", default_output)
+    updated = update_eink_display(img, output_path)
+    print(f"Image saved to: {output_path}")
+    if platform.system() != "Darwin":
+        if updated:
+            display_single_image(img)
+            print("Displayed on e-ink screen.")
+        else:
+            print("Image unchanged; skipping e-ink refresh.")
+    else:
+        print("Skipping e-ink display (running on macOS)")
+
+
+def main():
+    idea_config = business_idea_generator.load_config()
+    saint_config = saint_of_the_day.load_config()
+
+    print("Fetching business idea, saint of the day, and weather messages...")
+    idea, saint_info, weather_msg = fetch_all(idea_config, saint_config)
+
+    if idea:
+        print("\n" + "=" * 50)
+        print(idea)
+        print("=" * 50 + "\n")
+        business_idea_generator.save_idea_history(
+            idea, idea_config.get("history_file", "business_ideas_history.jsonl"))
+
+    if saint_info:
+        print("=" * 50)
+        print(saint_info)
+        print("=" * 50 + "\n")
+
+    if weather_msg:
+        print("Special Weather Messages:")
+        print(weather_msg)
+
+    # Serial display phase: the EPD can only show one image at a time
+    if idea:
+        render_and_display(idea, idea_config,
+                           business_idea_generator.generate_display_image,
+                           "business_idea.bmp")
+    if saint_info:
+        render_and_display(saint_info, saint_config,
+                           saint_of_the_day.generate_display_image,
+                           "saint_of_the_day.bmp")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,70 @@ import os
 import json
 import time
 import sys
+import re
+import bisect
 import fcntl
+import numpy as np
 sys.path.append('lib')  # Ensure the library path is correct
 from waveshare_epd import epd7in5_V2, epd7in3f  # Adjust the import based on your specific model
 from PIL import Image
 
+
+def pack_mono_buffer(image, epd):
+    """Pack the 1bpp e-ink buffer with NumPy.
+
+    epd.getbuffer walks every pixel in Python and then XOR-inverts the
+    buffer byte by byte; packbits does the same work in one C pass.
+    PIL mode "1" uses 1=white while the panel wants 0=white, hence the
+    inversion before packing.
+    """
+    if image.size == (epd.height, epd.width):
+        image = image.rotate(90, expand=True)
+    elif image.size != (epd.width, epd.height):
+        # Wrong dimensions: keep the driver's warning + blank-buffer behavior
+        return epd.getbuffer(image)
+    arr = np.asarray(image.convert("1"), dtype=np.uint8)
+    return np.packbits(arr ^ 1, axis=1).tobytes()
+
 starting_image = 0
 
+_FRAME_RE = re.compile(r"frame_(\d+)\.bmp")
+
 def file_generator(base_path, current_count, start_image, increment, max_attempts=10):
-    counter = current_count
-    attempts = 0
-    while attempts < max_attempts:
-        filename = os.path.join(base_path, f"frame_{counter:04d}.bmp")
+    # Enumerate the reel once (a single scandir) instead of stat-probing
+    # every candidate frame; sparse numbering just works because only
+    # frames that actually exist are listed.
+    frames = []
+    try:
+        for entry in os.scandir(base_path):
+            match = _FRAME_RE.fullmatch(entry.name)
+            if match:
+                frames.append((int(match.group(1)), entry.name))
+    except FileNotFoundError:
+        pass
+    frames.sort()
+    if not frames:
+        print('restarting reel... ')
+        return
+
+    counters = [c for c, _ in frames]
+    start_idx = bisect.bisect_left(counters, start_image)
+    if start_idx >= len(frames):
+        start_idx = 0
+    idx = bisect.bisect_left(counters, current_count)
+    if idx >= len(frames):
+        print('restarting reel... ')
+        idx = start_idx
+
+    while True:
+        counter, name = frames[idx]
+        filename = os.path.join(base_path, name)
         print(filename)
-        if not os.path.exists(filename):
-            print('restarting reel... ')
-            counter = start_image
-            attempts += 1
-            continue
         yield filename, counter
-        counter += increment
-        attempts = 0 
+        idx += increment
+        if idx >= len(frames):
+            print('restarting reel... ')
+            idx = start_idx
         
         
 def load_json_file(file_name):
@@ -49,11 +92,15 @@ def display_single_image(image_file):
     epd.init()
     epd.Clear()
 
-    # Load the processed image
-    image = Image.open(f'{image_file}')
+    # Accept an in-memory PIL Image so callers that just rendered one can
+    # skip the save-then-reload BMP round trip; paths still work.
+    if isinstance(image_file, Image.Image):
+        image = image_file
+    else:
+        image = Image.open(f'{image_file}')
 
     # Display the image
-    epd.display(epd.getbuffer(image))
+    epd.display(pack_mono_buffer(image, epd))
 
     epd.sleep()
     print('display is sleeping...' )
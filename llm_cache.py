@@ -0,0 +1,69 @@
+"""
+On-disk LLM response cache.
+
+Responses are keyed by a SHA-256 of (provider, model, prompt, temperature)
+and stored in SQLite with a timestamp, so deterministic prompts — like the
+saint of the day, whose prompt embeds the calendar date — cost one API call
+per day instead of one per run.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+
+from utils import get_logger
+
+logger = get_logger("llm_cache")
+
+DEFAULT_CACHE_PATH = "llm_cache.db"
+
+# Responses at higher temperatures are intentionally nondeterministic;
+# caching them would pin a single sample for the whole TTL.
+MAX_CACHEABLE_TEMPERATURE = 0.3
+
+
+def _cache_key(provider, model, prompt, temperature):
+    payload = json.dumps(
+        {"provider": provider, "model": model, "prompt": prompt, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _connect(cache_path):
+    conn = sqlite3.connect(cache_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body TEXT, ts INTEGER)"
+    )
+    return conn
+
+
+def get_or_call(provider, model, prompt, temperature, ttl, fn,
+                cache_path=DEFAULT_CACHE_PATH, force=False):
+    """Return a cached response for this exact request, or call fn() and store it.
+
+    ttl is in seconds. Requests above MAX_CACHEABLE_TEMPERATURE bypass the
+    cache unless force=True — use force for prompts that are deterministic
+    per key anyway (e.g. date-keyed daily content).
+    """
+    if ttl <= 0 or (temperature > MAX_CACHEABLE_TEMPERATURE and not force):
+        return fn()
+
+    key = _cache_key(provider, model, prompt, temperature)
+    now = int(time.time())
+    conn = _connect(cache_path)
+    try:
+        row = conn.execute("SELECT body, ts FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] < ttl:
+            logger.info("LLM cache hit (age %ds)", now - row[1])
+            return row[0]
+        body = fn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, ts) VALUES (?, ?, ?)",
+            (key, body, now),
+        )
+        conn.commit()
+        return body
+    finally:
+        conn.close()
@@ -1,5 +1,7 @@
 import time
 import json
+import hashlib
+import numpy as np
 import requests
 import io
 from typing import Any, Dict, List, Optional
@@ -29,6 +31,21 @@ NWS_KM_PER_PX = 1.533  # km per pixel in original NWS 600×550 radar image
 _conditions_cache = {"data": None, "ts": 0}
 _CONDITIONS_TTL = 300  # seconds
 
+# ---------------------------------------------------------------------------
+# QR code cache — URLs are per-station-static, and qrcode.make runs its
+# Reed-Solomon encoding in pure Python (~tens of ms per call)
+# ---------------------------------------------------------------------------
+_qr_cache: Dict[str, Image.Image] = {}
+
+
+def get_qr_image(url: str, size: int) -> Image.Image:
+    """Return the QR image for a URL at the given pixel size, cached."""
+    key = f"{url}@{size}"
+    if key not in _qr_cache:
+        _qr_cache[key] = qrcode.make(url).convert("RGB").resize(
+            (size, size), Image.LANCZOS)
+    return _qr_cache[key]
+
 
 def _deg_to_compass(deg: float) -> str:
     """Convert wind direction degrees (0-360) to 16-point compass string."""
@@ -397,8 +414,7 @@ def draw_conditions_panel(canvas, conditions, config, panel_x, panel_w, header_h
     # Paste QR filling temperature + feels-like height
     if qr_url:
         try:
-            qr_img = qrcode.make(qr_url).convert("RGB")
-            qr_img = qr_img.resize((qr_size, qr_size), Image.LANCZOS)
+            qr_img = get_qr_image(qr_url, qr_size)
             qr_x = panel_x + panel_w - margin - qr_size - config.get('panel_qr_x_offset', 0)
             qr_y = header_h + 6 + config.get('panel_qr_y_offset', 0)
             canvas.paste(qr_img, (qr_x, qr_y))
@@ -632,55 +648,21 @@ def load_state(state_file):
 
 
 def save_state(state_file, state):
-    with open(state_file, "w") as f:
+    # Write-then-rename so a crash mid-write can never leave a truncated
+    # radar_state.json behind; os.replace is atomic on the same filesystem.
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, "w") as f:
         json.dump(state, f)
-
-
-def images_are_equal(img1, img2):
-    if img1.mode != img2.mode or img1.size != img2.size:
-        return False
-    return list(img1.getdata()) == list(img2.getdata())
-
-
-def distance(c1, c2):
-    return math.sqrt((c1[0] - c2[0])**2 + (c1[1] - c2[1])**2 + (c1[2] - c2[2])**2)
+    os.replace(tmp_file, state_file)
 
 
 def quantize_to_seven_colors(input_path, output_path, more_colors, threshold=0):
-    white = (255, 255, 255)
-
-    if more_colors:
-        palette_5 = [
-            (255, 204, 204), (255, 102, 102), (255, 0, 0), (153, 0, 0), (102, 0, 0),
-            (204, 255, 204), (102, 255, 102), (0, 255, 0), (0, 153, 0), (0, 102, 0),
-            (204, 204, 255), (102, 102, 255), (0, 0, 255), (0, 0, 153), (0, 0, 102),
-            (255, 255, 204), (255, 255, 102), (255, 255, 0), (204, 204, 0), (153, 153, 0),
-            (255, 224, 192), (255, 178, 102), (255, 128, 0), (204, 102, 0), (153, 76, 0),
-            (0, 0, 0),
-        ]
-    else:
-        palette_5 = [
-            (255, 0, 0),
-            (0, 255, 0),
-            (0, 0, 255),
-            (255, 255, 0),
-            (255, 128, 0),
-            (0, 0, 0),
-        ]
-
-    original = Image.open(input_path).convert("RGB")
-    pixels = original.load()
-    width, height = original.size
-    for y in range(height):
-        for x in range(width):
-            p = pixels[x, y]
-            if distance(p, white) <= threshold:
-                pixels[x, y] = white
-            else:
-                best_color = min(palette_5, key=lambda color: distance(p, color))
-                pixels[x, y] = best_color
+    # Imported lazily: weather_generator imports this module at load time
+    # for panel support, so a top-level import here would be circular.
+    from weather_generator import open_rgb, quantize_image
 
-    original.save(output_path, format="bmp")
+    quantized = quantize_image(open_rgb(input_path), more_colors, threshold=threshold)
+    quantized.save(output_path, format="bmp")
     logger.info("Quantized image saved to %s", output_path)
 
 
@@ -698,10 +680,10 @@ def generate_weather_image(config, special_msg=None):
     quantized_output_path = config.get("quantized_path") or os.path.join(radar_folder, f"eink_quantized_display_{station}.bmp")
 
     radar_mode = config.get("radar_mode", "crop").lower()
+    resize_backend = config.get("resize_backend", "pil")
+    resample = config.get("resample", "bilinear")
     final_img = Image.new("RGB", (width, height), color=background_color)
 
-    radar_url = f"https://radar.weather.gov/ridge/standard/{station}_0.gif"
-
     if config.get("url_qr_loop", True):
         radar_url_qr = f"https://radar.weather.gov/ridge/standard/{station}_loop.gif"
     else:
@@ -711,30 +693,25 @@ def generate_weather_image(config, special_msg=None):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     }
 
-    for attempt in range(3):
-        response = requests.get(radar_url, headers=headers)
-        if response.status_code == 200:
-            break
-        elif response.status_code == 404 and attempt < 2:
-            logger.warning("Image not found (404). Retrying... (Attempt %d)", attempt + 1)
-            time.sleep(2)
-        else:
-            logger.error("Failed to fetch image. Status code: %d", response.status_code)
-            return None, False, None
+    # Conditional GET over the shared pooled session (lazy import, see
+    # quantize_to_seven_colors); a 304 reuses the cached GIF with zero
+    # body transfer. The pipeline still runs because panel/fit overlays
+    # (conditions, date, alerts) change independently of the frame.
+    from weather_generator import fetch_radar_bytes, quantize_image, resize_radar
 
-    content_type = response.headers.get("Content-Type", "")
-    if "image" not in content_type:
-        logger.error("Unexpected content type: %s", content_type)
+    radar_bytes, _ = fetch_radar_bytes(station)
+    if radar_bytes is None:
+        logger.error("Failed to fetch radar image for station %s.", station)
         return None, False, None
 
-    radar_img = Image.open(io.BytesIO(response.content)).convert("RGB")
+    radar_img = Image.open(io.BytesIO(radar_bytes)).convert("RGB")
     primary_region = None
 
     if radar_mode == "crop":
         scale = max(width / radar_img.width, height / radar_img.height)
         new_w = int(radar_img.width * scale)
         new_h = int(radar_img.height * scale)
-        scaled_radar = radar_img.resize((new_w, new_h), Image.LANCZOS)
+        scaled_radar = resize_radar(radar_img, (new_w, new_h), resize_backend, resample)
         left = (new_w - width) // 2
         top = (new_h - height) // 2
         processed_radar = scaled_radar.crop((left, top, left + width, top + height))
@@ -744,7 +721,7 @@ def generate_weather_image(config, special_msg=None):
         scale = min(width / data_radar.width, height / data_radar.height)
         new_w = int(data_radar.width * scale)
         new_h = int(data_radar.height * scale)
-        processed_radar = data_radar.resize((new_w, new_h), Image.LANCZOS)
+        processed_radar = resize_radar(data_radar, (new_w, new_h), resize_backend, resample)
         x_offset = (width - new_w) // 2
         y_offset = (height - new_h) // 2
         primary_region = (x_offset, y_offset, x_offset + new_w, y_offset + new_h)
@@ -760,7 +737,7 @@ def generate_weather_image(config, special_msg=None):
         scale = max(radar_w / radar_img.width, height / radar_img.height)
         rw = int(radar_img.width * scale)
         rh = int(radar_img.height * scale)
-        scaled_radar = radar_img.resize((rw, rh), Image.LANCZOS)
+        scaled_radar = resize_radar(radar_img, (rw, rh), resize_backend, resample)
         x_off = (radar_w - rw) // 2   # negative = PIL auto-crops the sides
         y_off = (height - rh) // 2
         final_img.paste(scaled_radar, (x_off, y_off))
@@ -842,15 +819,24 @@ def generate_weather_image(config, special_msg=None):
     if processed_radar is not None:
         final_img.paste(processed_radar, (0, 0))
 
-    old_quant = None
-    if os.path.exists(quantized_output_path):
-        old_quant = Image.open(quantized_output_path).convert("RGB")
+    # Hash of the previous quantized raster, kept in a sidecar file so the
+    # common no-change path never decodes the old BMP. SHA-256 matches the
+    # sidecars the weather_generator copy and eink_generator write.
+    hash_path = quantized_output_path + ".sha256"
+    old_hash = None
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            old_hash = f.read().strip()
+    elif os.path.exists(quantized_output_path):
+        # No sidecar yet (first run after upgrade): hash via one decode.
+        old_hash = hashlib.sha256(
+            Image.open(quantized_output_path).convert("RGB").tobytes()).hexdigest()
 
     # In panel mode the conditions panel has its own QR; top-right QR is for crop/fit only.
     if config.get("check_special_weather", True) and special_msg and radar_mode != "panel":
         try:
             special_url = config.get('special_url', "https://forecast.weather.gov/showsigwx.php?warnzone=TNZ027&warncounty=TNC037&firewxzone=TNZ027&local_place1=Nashville%20TN")
-            qr_topright = qrcode.make(special_url).convert("RGB").resize((138, 138), Image.LANCZOS)
+            qr_topright = get_qr_image(special_url, 138)
             _banner_h = config.get("alert_banner_height", 40)
             final_img.paste(qr_topright, (final_img.width - qr_topright.width - 2, _banner_h + 2))
         except Exception as e:
@@ -878,13 +864,21 @@ def generate_weather_image(config, special_msg=None):
             draw.text((8, text_y), headline, fill=(255, 255, 255), font=banner_font)
     # --- End Alert Banner ---
 
-    final_img.save(output_path)
-    logger.info("Saved final weather image to %s", output_path)
+    # The raw composed image is debug material only — nothing downstream
+    # reads it — so skip the ~1.1 MB write unless keep_raw asks for it.
+    if config.get("keep_raw", False):
+        final_img.save(output_path)
+        logger.info("Saved final weather image to %s", output_path)
 
+    # Quantize in memory from the image just composed — no BMP re-decode.
     more_colors = config.get('more_colors', False)
-    quantize_to_seven_colors(output_path, quantized_output_path, more_colors, threshold=75)
-    new_quant = Image.open(quantized_output_path).convert("RGB")
-    if old_quant is not None and images_are_equal(old_quant, new_quant):
+    new_quant = quantize_image(final_img, more_colors, threshold=75)
+    new_quant.save(quantized_output_path, format="bmp")
+    logger.info("Quantized image saved to %s", quantized_output_path)
+    new_hash = hashlib.sha256(new_quant.tobytes()).hexdigest()
+    with open(hash_path, "w") as f:
+        f.write(new_hash)
+    if old_hash == new_hash:
         logger.info("Station %s: Quantized image unchanged.", station)
         return None, False, primary_region
     return quantized_output_path, True, primary_region
@@ -894,11 +888,11 @@ def calculate_non_bw_percentage(image_path, region=None):
     image = Image.open(image_path).convert("RGB")
     if region:
         image = image.crop(region)
-    pixels = list(image.getdata())
-    if not pixels:
+    arr = np.frombuffer(image.tobytes(), dtype=np.uint8).reshape(-1, 3)
+    if arr.size == 0:
         return 0.0
-    non_bw_count = sum(1 for pixel in pixels if pixel not in [(0, 0, 0), (255, 255, 255)])
-    return (non_bw_count / len(pixels)) * 100
+    non_bw_count = np.count_nonzero((arr != 0).any(axis=1) & (arr != 255).any(axis=1))
+    return (non_bw_count / len(arr)) * 100
 
 
 def full_station_scan(config, skip_station=None):
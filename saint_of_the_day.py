@@ -8,10 +8,13 @@ of what they did or why they are a saint.
 
 import os
 import platform
-import requests
 import yaml
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
+
+from eink_generator import update_eink_display
+from llm_cache import get_or_call
+from text_render import render_text_image
+from utils import get_session
 
 if platform.system() != "Darwin":
     from display import display_single_image
@@ -35,7 +38,7 @@ def call_gemini_api(prompt, api_key, temperature=0.7):
         "generationConfig": {"temperature": temperature}
     }
 
-    response = requests.post(url, headers=headers, json=data, timeout=30)
+    response = get_session().post(url, headers=headers, json=data, timeout=30)
 
     if response.status_code == 200:
         result = response.json()
@@ -60,7 +63,7 @@ def call_openai_api(prompt, api_key, model="gpt-3.5-turbo", temperature=0.7):
         "temperature": temperature
     }
 
-    response = requests.post(url, headers=headers, json=data, timeout=30)
+    response = get_session().post(url, headers=headers, json=data, timeout=30)
 
     if response.status_code == 200:
         result = response.json()
@@ -69,15 +72,13 @@ def call_openai_api(prompt, api_key, model="gpt-3.5-turbo", temperature=0.7):
         raise RuntimeError(f"API Error: {response.status_code}, {response.text}")
 
 
-def get_saint_of_the_day(config):
-    """Get the saint of the day using the configured API."""
-    today = datetime.now()
-    date_str = today.strftime("%B %d")
-
-    prompt = f"""{config.get('prompt', f'''Today is {date_str}. Tell me about the Catholic saint whose feast day is celebrated today.
+# Static instructions kept as a module constant so the prompt prefix is
+# byte-identical across calls — providers cache shared prefixes, so only
+# the short date suffix varies from day to day.
+DEFAULT_SAINT_PROMPT = """Tell me about the Catholic saint whose feast day is celebrated on the date given at the end of this prompt.
 
 Include:
-DATE: {date_str}
+DATE: The given date
 
 SAINT: The saint's name and title
 
@@ -90,7 +91,18 @@ WHY A SAINT: What they did to become a saint or their significance (2-3 sentence
 PATRONAGE: What they are the patron saint of (if applicable)
 
 Keep the total response concise (under 180 words) for an e-ink display.
-No markdown formatting. If there are multiple saints, pick the most notable one.''')}"""
+No markdown formatting. If there are multiple saints, pick the most notable one."""
+
+
+def get_saint_of_the_day(config):
+    """Get the saint of the day using the configured API."""
+    today = datetime.now()
+    date_str = today.strftime("%B %d")
+
+    # Static prefix first, variable date last
+    prompt = f"""{config.get('prompt', DEFAULT_SAINT_PROMPT)}
+
+Today is {date_str}."""
 
     # Replace date placeholder in custom prompts
     prompt = prompt.replace("{date}", date_str)
@@ -99,86 +111,31 @@ No markdown formatting. If there are multiple saints, pick the most notable one.
     api_provider = config.get("api_provider", "gemini").lower()
     temperature = config.get("temperature", 0.7)
 
+    # The prompt embeds today's date, so one API call per day serves all
+    # reruns; force=True because the per-day key is deterministic anyway.
+    ttl = config.get("cache_ttl", 86400)
+
     if api_provider == "openai":
         api_key = config.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
         model = config.get("openai_model", "gpt-3.5-turbo")
-        return call_openai_api(prompt, api_key, model, temperature)
+        return get_or_call(
+            "openai", model, prompt, temperature, ttl,
+            lambda: call_openai_api(prompt, api_key, model, temperature),
+            force=True)
     else:
         api_key = config.get("GEMINI_API_KEY") or os.environ.get("GEMINI_API_KEY")
-        return call_gemini_api(prompt, api_key, temperature)
-
-
-def wrap_text(text, font, draw, max_width):
-    """Wrap text to fit within max_width."""
-    words = text.split()
-    if not words:
-        return ""
-
-    lines = []
-    current_line = words[0]
-
-    for word in words[1:]:
-        test_line = current_line + " " + word
-        bbox = draw.textbbox((0, 0), test_line, font=font)
-        if bbox[2] - bbox[0] <= max_width:
-            current_line = test_line
-        else:
-            lines.append(current_line)
-            current_line = word
-    lines.append(current_line)
-
-    return "\n".join(lines)
+        return get_or_call(
+            "gemini", "gemini-2.0-flash", prompt, temperature, ttl,
+            lambda: call_gemini_api(prompt, api_key, temperature),
+            force=True)
 
 
 def generate_display_image(text, config):
     """Generate an image with the saint info for e-ink display."""
-    width = config.get("width", 800)
-    height = config.get("height", 480)
-    bg_color = config.get("background_color", "white")
-    text_color = config.get("text_color", "black")
-    max_font_size = config.get("max_font_size", 32)
-    min_font_size = config.get("min_font_size", 12)
-    margin = config.get("margin", 20)
-
-    # Select font based on platform
-    if platform.system() == "Darwin":
-        font_path = "/Library/Fonts/Arial.ttf"
-    else:
-        font_path = "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf"
-
-    font_path = config.get("font_path", font_path)
-
-    img = Image.new("RGB", (width, height), color=bg_color)
-    draw = ImageDraw.Draw(img)
-
-    # Find largest font size that fits
-    font_size = max_font_size
-    while font_size >= min_font_size:
-        font = ImageFont.truetype(font_path, font_size)
-        wrapped = wrap_text(text, font, draw, width - 2 * margin)
-        bbox = draw.multiline_textbbox((0, 0), wrapped, font=font)
-        text_height = bbox[3] - bbox[1]
-        text_width = bbox[2] - bbox[0]
-
-        if text_height <= height - 2 * margin and text_width <= width - 2 * margin:
-            break
-        font_size -= 2
-
-    # Use minimum font size if nothing fits
-    if font_size < min_font_size:
-        font_size = min_font_size
-        font = ImageFont.truetype(font_path, font_size)
-        wrapped = wrap_text(text, font, draw, width - 2 * margin)
-        bbox = draw.multiline_textbbox((0, 0), wrapped, font=font)
-        text_height = bbox[3] - bbox[1]
-        text_width = bbox[2] - bbox[0]
-
-    # Center the text
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2
-    draw.multiline_text((x, y), wrapped, fill=text_color, font=font, align="left")
-
-    return img
+    cfg = dict(config)
+    cfg.setdefault("max_font_size", 32)
+    cfg.setdefault("min_font_size", 12)
+    return render_text_image(text, cfg)
 
 
 def main():
@@ -201,16 +158,20 @@ def main():
     print(saint_info)
     print("=" * 50 + "\n")
 
-    # Generate display image
+    # Generate display image; skip the slow e-ink refresh when unchanged
+    # (the saint is the same all day, so reruns hit this path)
     img = generate_display_image(saint_info, config)
     output_path = config.get("output_path", "saint_of_the_day.bmp")
-    img.save(output_path)
+    updated = update_eink_display(img, output_path)
     print(f"Image saved to: {output_path}")
 
     # Display on e-ink if not on macOS
     if platform.system() != "Darwin":
-        display_single_image(output_path)
-        print("Displayed on e-ink screen.")
+        if updated:
+            display_single_image(img)  # in-memory; skips the BMP re-decode
+            print("Displayed on e-ink screen.")
+        else:
+            print("Image unchanged; skipping e-ink refresh.")
     else:
         print("Skipping e-ink display (running on macOS)")
 
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Standalone full-station radar scan.
+
+Runs the all-stations interest scan and caches the top-5 ranking in
+radar_state.json, keeping that work off the per-tick display refresh
+path. Schedule it from cron or a systemd timer (hourly matches the old
+inline cadence). weather_generator.main() reads the cached top5 and by
+default still falls back to an inline scan when the cache goes stale;
+set external_scan: true in config once this job is scheduled so the
+display tick trusts the cache entirely.
+"""
+
+import os
+import time
+
+from eink_generator import load_config
+from weather_generator import (STATE_FILE, full_station_scan, load_state,
+                               save_state, update_top5)
+
+
+def main():
+    os.makedirs("radar", exist_ok=True)
+    config = load_config("config.yml")
+    state = load_state(STATE_FILE) or {}
+
+    percentages = full_station_scan(config)
+    top5_list = update_top5(percentages)
+    state["top5"] = [{"station": s, "percentage": p} for s, p in top5_list]
+    state["last_full_scan"] = time.time()
+    save_state(STATE_FILE, state)
+    print(f"Scan complete; top 5 stations: {[s for s, _ in top5_list]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,33 @@
-import requests
-import re
+from lxml import html
+
+from utils import get_session
 
 
 URL = "https://forecast.weather.gov/showsigwx.php?warnzone=TNZ027&warncounty=TNC037&firewxzone=TNZ027&local_place1=Nashville%20TN"
 
 def get_special_weather_messages(url=URL):
     print('checking special weather message')
-    response = requests.get(url)
+    response = get_session().get(url, timeout=10)
     if response.status_code != 200:
         print(f"Failed to retrieve data. Status code: {response.status_code}")
         return None
-    
-    # Extract relevant weather messages using regex from <pre> tag
-    matches = re.findall(r'<pre[^>]*>(.*?)</pre>', response.text, re.DOTALL)
-    if matches:
-        messages = '\n\n'.join(re.sub(r'<.*?>', '', match).strip() for match in matches)
-        return messages
+
+    # Single C-level parse of the page; text_content() strips any inner
+    # tags, replacing the old two-pass regex extraction.
+    tree = html.fromstring(response.content)
+    pre_blocks = [pre.text_content().strip() for pre in tree.findall('.//pre')]
+    if pre_blocks:
+        return '\n\n'.join(pre_blocks)
     else:
-        return None 
+        return None
 
 if __name__ == "__main__":
     url = "https://forecast.weather.gov/showsigwx.php?warnzone=TNZ027&warncounty=TNC037&firewxzone=TNZ027&local_place1=Nashville%20TN"
     messages = get_special_weather_messages(url)
-    
+
     if messages:
         print("Special Weather Messages:")
         print(messages)
 
 
-# send text to LLM and return it 
\ No newline at end of file
+# send text to LLM and return it
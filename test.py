@@ -1,4 +1,5 @@
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image
 
 from display import display_color_image
 
@@ -20,16 +21,20 @@ height = 480
 # Compute stripe height (using integer division)
 stripe_height = height // len(colors)  # This gives 68
 
-# Create a new RGB image
-img = Image.new("RGB", (width, height))
-draw = ImageDraw.Draw(img)
-
-# Draw each stripe
-for i, color in enumerate(colors):
+# Build the image as a palette-indexed ("P") image up front: 1 byte/pixel
+# instead of 3, and the display driver's nearest-palette quantization has
+# nothing to do since every pixel is already a palette index.
+index = np.empty((height, width), dtype=np.uint8)
+for i in range(len(colors)):
     top = i * stripe_height
     # For the last stripe, fill to the full image height to cover any remainder.
     bottom = height if i == len(colors) - 1 else (i + 1) * stripe_height
-    draw.rectangle([0, top, width, bottom], fill=color)
+    index[top:bottom] = i
+
+img = Image.fromarray(index, "P")
+palette = [channel for color in colors for channel in color]
+palette.extend([0] * (768 - len(palette)))
+img.putpalette(palette)
 
 # Save and show the image
 img.save("test_striped_image.bmp")
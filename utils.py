@@ -8,9 +8,12 @@ so every module uses a single source of truth.
 import logging
 import platform
 import sys
+from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from typing import Dict, List, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
 from PIL import ImageFont
 
 MODULE_MAP: Dict[str, str] = {
@@ -58,6 +61,16 @@ _BOLD_FONTS = [
 ]
 
 
+@lru_cache(maxsize=128)
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Memoized ImageFont.truetype — one TTF parse per (path, size).
+
+    The font-sizing loops probe the same file at many sizes every run;
+    caching keeps each probe to a dict lookup instead of a disk re-parse.
+    """
+    return ImageFont.truetype(path, size)
+
+
 def get_font(size: int, bold: bool = False, config: Optional[dict] = None) -> ImageFont.FreeTypeFont:
     """Load a TrueType font at the given size, with platform-aware fallbacks.
 
@@ -75,13 +88,34 @@ def get_font(size: int, bold: bool = False, config: Optional[dict] = None) -> Im
 
     for path in paths:
         try:
-            return ImageFont.truetype(path, size)
+            return load_font(path, size)
         except Exception:
             continue
 
     return ImageFont.load_default()
 
 
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Return a shared requests.Session with connection pooling.
+
+    Reusing one session keeps TCP/TLS connections alive across calls
+    instead of paying a fresh handshake for every requests.get/post.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        # Sized past the station scan's 8 workers so concurrent fetches
+        # all get kept-alive connections instead of the pool discarding
+        # half of them on return.
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
 _LOG_FORMAT = "%(asctime)s [%(name)s] %(levelname)s %(message)s"
 _LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
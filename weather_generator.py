@@ -1,13 +1,17 @@
 import time
 import json
-import requests
+import numpy as np
 import io
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
 from special_weather_message import get_special_weather_messages
+from utils import get_session
 from eink_generator import load_config  # assuming load_config loads your YAML config
 from detailed_forecast import get_detailed_forecast, generate_forecast_image
-import math
+import hashlib
+import mmap
+import struct
+from concurrent.futures import ThreadPoolExecutor
 import platform
 import os
 
@@ -17,6 +21,18 @@ try:
 except ImportError:
     _PANEL_SUPPORT = False
 
+try:
+    from numba import njit, prange
+    _NUMBA_SUPPORT = True
+except ImportError:
+    _NUMBA_SUPPORT = False
+
+try:
+    import cv2
+    _CV2_SUPPORT = True
+except ImportError:
+    _CV2_SUPPORT = False
+
 if platform.system() == "Linux":  # Only import on Raspberry Pi
     # from waveshare_epd import epd7in5_V2, epd7in3f  # Adjust the import based on your specific model
     from display import display_color_image
@@ -24,6 +40,63 @@ if platform.system() == "Linux":  # Only import on Raspberry Pi
 
 STATE_FILE = os.path.join("radar", "radar_state.json")
 
+RADAR_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+def fetch_radar_bytes(station):
+    """Fetch the latest radar GIF for a station using a conditional GET.
+
+    The previous response's ETag/Last-Modified headers and body are cached
+    under radar/; when NWS has not published a new frame the server answers
+    304 and the cached bytes are reused with zero body transfer.
+    Returns (gif_bytes, not_modified); gif_bytes is None on failure.
+    """
+    radar_url = f"https://radar.weather.gov/ridge/standard/{station}_0.gif"
+    gif_path = os.path.join("radar", f"{station}.gif")
+    meta_path = gif_path + ".meta"
+
+    headers = dict(RADAR_HEADERS)
+    if os.path.exists(gif_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        except (ValueError, OSError):
+            pass
+
+    # Retry mechanism for fetching the radar image
+    for attempt in range(3):
+        response = get_session().get(radar_url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            print(f"Station {station}: radar unchanged (304); using cached GIF.")
+            with open(gif_path, "rb") as f:
+                return f.read(), True
+        if response.status_code == 200:
+            break
+        elif response.status_code == 404 and attempt < 2:
+            print(f"Image not found (404). Retrying in 30 seconds... (Attempt {attempt + 1})")
+            time.sleep(2)
+        else:
+            print(f"Failed to fetch image. Status code: {response.status_code}")
+            return None, False  # Stop execution
+
+    content_type = response.headers.get("Content-Type", "")
+    if "image" not in content_type:
+        print(f"Unexpected content type: {content_type}")
+        print(f"Response content (first 500 bytes): {response.content[:500]}")
+        return None, False
+
+    with open(gif_path, "wb") as f:
+        f.write(response.content)
+    with open(meta_path, "w") as f:
+        json.dump({"etag": response.headers.get("ETag"),
+                   "last_modified": response.headers.get("Last-Modified")}, f)
+    return response.content, False
+
 def load_state(state_file):
     if os.path.exists(state_file):
         with open(state_file, "r") as f:
@@ -31,97 +104,290 @@ def load_state(state_file):
     return None
 
 def save_state(state_file, state):
-    with open(state_file, "w") as f:
+    # Write-then-rename so a crash mid-write can never leave a truncated
+    # radar_state.json behind; os.replace is atomic on the same filesystem.
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, "w") as f:
         json.dump(state, f)
+    os.replace(tmp_file, state_file)
 
 def images_are_equal(img1, img2):
     if img1.mode != img2.mode or img1.size != img2.size:
         return False
-    return list(img1.getdata()) == list(img2.getdata())
-    
-def distance(c1, c2):
-    # Euclidean distance in RGB space
-    return math.sqrt((c1[0] - c2[0])**2 + (c1[1] - c2[1])**2 + (c1[2] - c2[2])**2)
-
-def quantize_to_seven_colors(input_path, output_path, more_colors, threshold=0):
+    # Single C-level memcmp over the raw buffers; no per-pixel tuple lists.
+    return img1.tobytes() == img2.tobytes()
+
+
+WHITE = (255, 255, 255)
+
+# Extended palette: five shades per hue plus black (white is handled by the
+# threshold snap and prepended where a full palette is needed).
+PALETTE_EXTENDED = [
+    # Red steps
+    (255, 204, 204),  # Light Red
+    (255, 102, 102),  # Medium Light Red
+    (255, 0, 0),      # Red
+    (153, 0, 0),      # Dark Red
+    (102, 0, 0),      # Very Dark Red
+
+    # Green steps
+    (204, 255, 204),  # Light Green
+    (102, 255, 102),  # Medium Light Green
+    (0, 255, 0),      # Green
+    (0, 153, 0),      # Dark Green
+    (0, 102, 0),      # Very Dark Green
+
+    # Blue steps
+    (204, 204, 255),  # Light Blue
+    (102, 102, 255),  # Medium Light Blue
+    (0, 0, 255),      # Blue
+    (0, 0, 153),      # Dark Blue
+    (0, 0, 102),      # Very Dark Blue
+
+    # Yellow steps
+    (255, 255, 204),  # Light Yellow
+    (255, 255, 102),  # Medium Light Yellow
+    (255, 255, 0),    # Yellow
+    (204, 204, 0),    # Dark Yellow
+    (153, 153, 0),    # Very Dark Yellow
+
+    # Orange steps
+    (255, 224, 192),  # Light Orange
+    (255, 178, 102),  # Medium Light Orange
+    (255, 128, 0),    # Orange
+    (204, 102, 0),    # Dark Orange
+    (153, 76, 0),     # Very Dark Orange
+
+    # Black and white
+    (0, 0, 0),        # Black
+]
+
+PALETTE_BASIC = [
+    (255, 0, 0),   # red
+    (0, 255, 0),   # green
+    (0, 0, 255),   # blue
+    (255, 255, 0), # yellow
+    (255, 128, 0), # orange
+    (0, 0, 0),     # black
+]
+
+# Precomputed per-palette arrays and packed uint32 keys so each quantize
+# call binds constants instead of rebuilding lists and arrays.
+_PAL_ARRAYS = {}
+for _more, _pal in ((True, PALETTE_EXTENDED), (False, PALETTE_BASIC)):
+    _PAL_ARRAYS[_more] = (
+        np.array(_pal, dtype=np.int32),
+        np.array([(r << 16) | (g << 8) | b for r, g, b in [WHITE] + _pal],
+                 dtype=np.uint32),
+    )
+
+def quantize_image(img, more_colors, threshold=0, dither=False):
+    """
+    In-memory core of quantize_to_seven_colors: map an RGB image onto the
+    7-color (or extended) palette and return the result as a new image,
+    so callers that already hold the pixels skip the BMP round trip.
+    """
+    palette_5 = PALETTE_EXTENDED if more_colors else PALETTE_BASIC
+    white = WHITE
+    pal, pal_keys = _PAL_ARRAYS[bool(more_colors)]
+
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    # Already-in-palette inputs need no search: pack each pixel and palette
+    # entry into a uint32 key and bail out if every pixel matches. A
+    # np.isin over the frame costs a couple ms and makes the quantizer
+    # idempotent on its own output.
+    px = np.asarray(img, dtype=np.uint32)
+    keys = (px[..., 0] << 16) | (px[..., 1] << 8) | px[..., 2]
+    if np.isin(keys, pal_keys).all():
+        return img
+
+    arr = np.asarray(img, dtype=np.int32)
+    white_d2 = ((arr - np.array(white, dtype=np.int32)) ** 2).sum(axis=-1)
+    near_white = white_d2 <= threshold * threshold
+
+    if dither:
+        # Snap near-white to white first so the diffuser cannot sprinkle
+        # palette colors into clear sky, then hand off to PIL's quantize.
+        work = np.asarray(img).copy()
+        work[near_white] = white
+        palette_img = Image.new("P", (1, 1))
+        flat = list(white) + [channel for color in palette_5 for channel in color]
+        flat.extend([0] * (768 - len(flat)))
+        palette_img.putpalette(flat)
+        dithered = Image.fromarray(work, "RGB").quantize(
+            palette=palette_img, dither=Image.FLOYDSTEINBERG)
+        return dithered.convert("RGB")
+
+    # Prefer the JIT kernel when numba is installed: same result as the
+    # broadcast path but with row-sized temporaries instead of an
+    # (H, W, P) distance tensor.
+    if _NUMBA_SUPPORT:
+        out = np.empty(arr.shape, dtype=np.uint8)
+        _quantize_kernel(arr, pal, threshold * threshold, out)
+        return Image.fromarray(out, "RGB")
+
+    # Vectorized nearest-palette mapping, accumulated channel-wise (SoA):
+    # three (H, W, P) broadcasts instead of one (H, W, P, 3) tensor cuts
+    # the temporary memory traffic of this memory-bound kernel to a third.
+    # Squared distances compare the same as Euclidean, so no sqrt needed.
+    pal_r, pal_g, pal_b = pal[:, 0], pal[:, 1], pal[:, 2]
+    dr = arr[..., 0, None] - pal_r
+    dg = arr[..., 1, None] - pal_g
+    db = arr[..., 2, None] - pal_b
+    d2 = dr * dr + dg * dg + db * db
+    idx = d2.argmin(axis=-1)
+    out = pal[idx].astype(np.uint8)
+
+    # Near-white pixels snap to white regardless of the palette winner.
+    out[near_white] = white
+
+    return Image.fromarray(out, "RGB")
+
+def quantize_to_seven_colors(input_path, output_path, more_colors, threshold=0, dither=False):
     """
     Quantize an image to 7 colors:
       - Pixels within a Euclidean distance 'threshold' of white (255,255,255) are set to white.
       - All other pixels are mapped to the closest color from a fixed five-color palette.
-    """
-    white = (255, 255, 255)
-
-    if more_colors:
-        palette_5 = [
-        # Red steps
-        (255, 204, 204),  # Light Red
-        (255, 102, 102),  # Medium Light Red
-        (255, 0, 0),      # Red
-        (153, 0, 0),      # Dark Red
-        (102, 0, 0),      # Very Dark Red
-
-        # Green steps
-        (204, 255, 204),  # Light Green
-        (102, 255, 102),  # Medium Light Green
-        (0, 255, 0),      # Green
-        (0, 153, 0),      # Dark Green
-        (0, 102, 0),      # Very Dark Green
-
-        # Blue steps
-        (204, 204, 255),  # Light Blue
-        (102, 102, 255),  # Medium Light Blue
-        (0, 0, 255),      # Blue
-        (0, 0, 153),      # Dark Blue
-        (0, 0, 102),      # Very Dark Blue
-
-        # Yellow steps
-        (255, 255, 204),  # Light Yellow
-        (255, 255, 102),  # Medium Light Yellow
-        (255, 255, 0),    # Yellow
-        (204, 204, 0),    # Dark Yellow
-        (153, 153, 0),    # Very Dark Yellow
-
-        # Orange steps
-        (255, 224, 192),  # Light Orange
-        (255, 178, 102),  # Medium Light Orange
-        (255, 128, 0),    # Orange
-        (204, 102, 0),    # Dark Orange
-        (153, 76, 0),     # Very Dark Orange
-
-        # Black and white
-        (0, 0, 0),        # Black
-
-    ]
-    else: 
-        palette_5 = [
-        (255, 0, 0),   # red
-        (0, 255, 0),   # green
-        (0, 0, 255),   # blue
-        (255, 255, 0), # yellow
-        (255, 128, 0), # orange
-        (0, 0, 0)     # black
-        ]
-    
-    original = Image.open(input_path).convert("RGB")
-    pixels = original.load()
-    width, height = original.size
-    for y in range(height):
-        for x in range(width):
-            p = pixels[x, y]
-            if distance(p, white) <= threshold:
-                pixels[x, y] = white
-            else:
-                best_color = min(palette_5, key=lambda color: distance(p, color))
-                pixels[x, y] = best_color
 
-    original.save(output_path, format="bmp")
+    File-path wrapper around quantize_image for callers working on disk.
+    With dither=True the palette mapping runs through PIL's C-level
+    Floyd-Steinberg diffuser instead of a hard nearest-color map, which
+    hides banding in gradient regions at no extra Python cost.
+    """
+    save_bmp_topdown(quantize_image(open_rgb(input_path), more_colors,
+                                    threshold=threshold, dither=dither), output_path)
     print(f"Quantized image saved to {output_path}")
 
-def generate_weather_image(config, special_msg=None):
+if _NUMBA_SUPPORT:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _quantize_kernel(arr, pal, thr2, out):
+        """Row-parallel nearest-palette search with only scalar temporaries.
+
+        Matches the NumPy broadcast path pixel-for-pixel but never builds
+        the (H, W, P) distance tensor, which matters on low-RAM hosts.
+        """
+        height, width = arr.shape[0], arr.shape[1]
+        n_colors = pal.shape[0]
+        for y in prange(height):
+            for x in range(width):
+                r, g, b = arr[y, x, 0], arr[y, x, 1], arr[y, x, 2]
+                if (255 - r) ** 2 + (255 - g) ** 2 + (255 - b) ** 2 <= thr2:
+                    out[y, x, 0] = 255
+                    out[y, x, 1] = 255
+                    out[y, x, 2] = 255
+                    continue
+                best = 0
+                best_d2 = (r - pal[0, 0]) ** 2 + (g - pal[0, 1]) ** 2 + (b - pal[0, 2]) ** 2
+                for i in range(1, n_colors):
+                    d2 = (r - pal[i, 0]) ** 2 + (g - pal[i, 1]) ** 2 + (b - pal[i, 2]) ** 2
+                    if d2 < best_d2:
+                        best_d2 = d2
+                        best = i
+                out[y, x, 0] = pal[best, 0]
+                out[y, x, 1] = pal[best, 1]
+                out[y, x, 2] = pal[best, 2]
+
+
+def bmp_raw_bytes(path):
+    """Return a 24-bit BMP's pixel data in top-down RGB order, without decoding.
+
+    The pipeline's own uncompressed BMPs are mmap'd and viewed directly:
+    skip to the pixel-array offset from the header, drop row padding, swap
+    BGR to RGB, and flip bottom-up storage so the result compares equal to
+    Image.tobytes(). Returns None for anything but plain 24-bit BMPs.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+        try:
+            if mm[:2] != b"BM" or int.from_bytes(mm[28:30], "little") != 24:
+                return None
+            if int.from_bytes(mm[30:34], "little") != 0:  # BI_RGB only
+                return None
+            offset = int.from_bytes(mm[10:14], "little")
+            width = int.from_bytes(mm[18:22], "little", signed=True)
+            height = int.from_bytes(mm[22:26], "little", signed=True)
+            stride = (width * 3 + 3) & ~3
+            rows = abs(height)
+            arr = np.frombuffer(mm, dtype=np.uint8, offset=offset,
+                                count=stride * rows).reshape(rows, stride)
+            arr = arr[:, :width * 3].reshape(rows, width, 3)[..., ::-1]
+            if height > 0:  # positive height = bottom-up row order
+                arr = arr[::-1]
+            raw = np.ascontiguousarray(arr).tobytes()
+            del arr  # release the buffer view so the mmap can close
+            return raw
+        finally:
+            mm.close()
+
+
+def save_bmp_topdown(img, path):
+    """Write an RGB image as an uncompressed 24-bit top-down BMP.
+
+    Pillow's general BMP encoder walks mode/palette/compression checks and
+    stores rows bottom-up. The pipeline's outputs are always plain RGB, so
+    write a fixed 54-byte header (negative biHeight = top-down rows) and
+    dump the pixel array in one buffer. Top-down order keeps the on-disk
+    bytes row-aligned with Image.tobytes() for the mmap compare path.
+    """
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    arr = np.asarray(img, dtype=np.uint8)
+    height, width = arr.shape[:2]
+    stride = (width * 3 + 3) & ~3
+    rows = np.zeros((height, stride), dtype=np.uint8)
+    rows[:, :width * 3] = arr[..., ::-1].reshape(height, width * 3)  # RGB -> BGR
+    pixel_data = rows.tobytes()
+    file_header = struct.pack("<2sIHHI", b"BM", 54 + len(pixel_data), 0, 0, 54)
+    info_header = struct.pack("<IiiHHIIiiII", 40, width, -height, 1, 24, 0,
+                              len(pixel_data), 2835, 2835, 0, 0)
+    with open(path, "wb") as f:
+        f.write(file_header + info_header + pixel_data)
+
+
+def open_rgb(path):
+    """Open one of the pipeline's own BMPs as RGB.
+
+    24-bit BMPs already decode straight to RGB, so the usual unconditional
+    convert("RGB") would allocate and copy a fresh ~1.2 MB buffer for
+    nothing; only convert when the mode genuinely differs.
+    """
+    img = Image.open(path, formats=["BMP"])
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+
+def resize_radar(img, size, backend="pil", resample="bilinear"):
+    """Resize a radar frame.
+
+    Every resize in the pipeline funnels through here, so swapping in a
+    SIMD-accelerated Pillow build (pillow-simd) — or changing the filter —
+    speeds up or retunes all radar modes in one place.
+
+    The default filter is bilinear: the source is a coarse radar GIF and
+    the output goes straight through 7-color quantization, so the 4-lobe
+    Lanczos kernel costs 3-4x more per pixel for a difference the panel
+    cannot show. Set resample: lanczos in config to get it back.
+    backend="cv2" uses OpenCV's SIMD filters (NEON on the Pi) when cv2 is
+    installed, falling back to Pillow otherwise.
+    """
+    lanczos = resample == "lanczos"
+    if backend == "cv2" and _CV2_SUPPORT:
+        interp = cv2.INTER_LANCZOS4 if lanczos else cv2.INTER_LINEAR
+        return Image.fromarray(cv2.resize(np.asarray(img), size, interpolation=interp))
+    return img.resize(size, Image.LANCZOS if lanczos else Image.BILINEAR)
+
+def generate_weather_image(config, special_msg=None, radar_bytes=None):
     """
     Generate a weather image from the National Weather Service radar for the given station.
     Saves the image (and its quantized version) into the "radar" folder.
-    Returns a tuple (output_path, updated) where updated is False if the generated image is identical.
+    Returns a tuple (output_path, updated, percentage) where updated is
+    False if the generated image is identical and percentage is the
+    non-black/white pixel share of the quantized raster (None when the
+    pipeline was skipped before producing one).
+
+    radar_bytes may carry a pre-fetched GIF (see full_station_scan); when
+    None the radar is fetched here.
     """
     radar_folder = "radar"
     os.makedirs(radar_folder, exist_ok=True)
@@ -135,40 +401,31 @@ def generate_weather_image(config, special_msg=None):
     quantized_output_path = config.get("quantized_path") or os.path.join(radar_folder, f"eink_quantized_display_{station}.bmp")
 
     radar_mode = config.get("radar_mode", "crop").lower()
+    resize_backend = config.get("resize_backend", "pil")
+    resample = config.get("resample", "bilinear")
     final_img = Image.new("RGB", (width, height), color=background_color)
 
-    radar_url = f"https://radar.weather.gov/ridge/standard/{station}_0.gif"
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-
-    # Retry mechanism for fetching the radar image
-    for attempt in range(3):
-        response = requests.get(radar_url, headers=headers)
-        if response.status_code == 200:
-            break
-        elif response.status_code == 404 and attempt < 2:
-            print(f"Image not found (404). Retrying in 30 seconds... (Attempt {attempt + 1})")
-            time.sleep(2)
-        else:
-            print(f"Failed to fetch image. Status code: {response.status_code}")
-            return None  # Stop execution
-
-    content_type = response.headers.get("Content-Type", "")
-    if "image" not in content_type:
-        print(f"Unexpected content type: {content_type}")
-        print(f"Response content (first 500 bytes): {response.content[:500]}")
-        return None
+    if radar_bytes is None:
+        radar_bytes, not_modified = fetch_radar_bytes(station)
+        # A 304 means the upstream frame is byte-identical; outside panel
+        # mode (which embeds live conditions and the date) the existing
+        # quantized output is authoritative, so skip the whole pipeline.
+        if (not_modified and radar_mode != "panel"
+                and os.path.exists(quantized_output_path)
+                and os.path.exists(quantized_output_path + ".sha256")):
+            print(f"Station {station}: radar not modified; keeping existing output.")
+            return None, False, None
+    if radar_bytes is None:
+        return None, False, None  # Stop execution
 
     # Try opening the image
-    radar_img = Image.open(io.BytesIO(response.content)).convert("RGB")
+    radar_img = Image.open(io.BytesIO(radar_bytes)).convert("RGB")
     
     if radar_mode == "crop":
         scale = max(width / radar_img.width, height / radar_img.height)
         new_w = int(radar_img.width * scale)
         new_h = int(radar_img.height * scale)
-        scaled_radar = radar_img.resize((new_w, new_h), Image.LANCZOS)
+        scaled_radar = resize_radar(radar_img, (new_w, new_h), resize_backend, resample)
         left = (new_w - width) // 2
         top = (new_h - height) // 2
         processed_radar = scaled_radar.crop((left, top, left + width, top + height))
@@ -176,7 +433,7 @@ def generate_weather_image(config, special_msg=None):
         scale = min(width / radar_img.width, height / radar_img.height)
         new_w = int(radar_img.width * scale)
         new_h = int(radar_img.height * scale)
-        processed_radar = radar_img.resize((new_w, new_h), Image.LANCZOS)
+        processed_radar = resize_radar(radar_img, (new_w, new_h), resize_backend, resample)
         x_offset = (width - new_w) // 2
         y_offset = (height - new_h) // 2
         final_img.paste(processed_radar, (x_offset, y_offset))
@@ -187,7 +444,7 @@ def generate_weather_image(config, special_msg=None):
             scale = max(width / radar_img.width, height / radar_img.height)
             new_w = int(radar_img.width * scale)
             new_h = int(radar_img.height * scale)
-            scaled_radar = radar_img.resize((new_w, new_h), Image.LANCZOS)
+            scaled_radar = resize_radar(radar_img, (new_w, new_h), resize_backend, resample)
             left = (new_w - width) // 2
             top = (new_h - height) // 2
             processed_radar = scaled_radar.crop((left, top, left + width, top + height))
@@ -201,7 +458,7 @@ def generate_weather_image(config, special_msg=None):
             scale = max(radar_w / radar_img.width, height / radar_img.height)
             rw = int(radar_img.width * scale)
             rh = int(radar_img.height * scale)
-            scaled_radar = radar_img.resize((rw, rh), Image.LANCZOS)
+            scaled_radar = resize_radar(radar_img, (rw, rh), resize_backend, resample)
             x_off = (radar_w - rw) // 2   # negative = PIL auto-crops the sides
             y_off = (height - rh) // 2
             final_img.paste(scaled_radar, (x_off, y_off))
@@ -213,7 +470,7 @@ def generate_weather_image(config, special_msg=None):
             forecast_loc = config.get("forecast_location", {})
             lat = forecast_loc.get("latitude")
             lon = forecast_loc.get("longitude")
-            conditions = fetch_current_conditions(lat, lon, headers) if lat and lon else None
+            conditions = fetch_current_conditions(lat, lon, RADAR_HEADERS) if lat and lon else None
             # QR URL: alert link when active, otherwise radar loop
             special_url = config.get('special_url', "https://forecast.weather.gov/showsigwx.php?warnzone=TNZ027&warncounty=TNC037&firewxzone=TNZ027&local_place1=Nashville%20TN")
             if config.get("check_special_weather", True) and special_msg:
@@ -279,54 +536,94 @@ def generate_weather_image(config, special_msg=None):
     if processed_radar is not None:
         final_img.paste(processed_radar, (0, 0))
 
-    # If a quantized image already exists, load it for later comparison.
-    old_quant = None
-    if os.path.exists(quantized_output_path):
-        old_quant = Image.open(quantized_output_path).convert("RGB")
-    
-
-    final_img.save(output_path)
-    print(f"Saved final weather image to {output_path}")
-    # Generate new quantized image from the updated raw image.
-
+    # Hash of the previous quantized raster, kept in a sidecar file so the
+    # common no-change path never decodes the old BMP. SHA-256 matches the
+    # sidecars eink_generator writes and is hardware-accelerated on the Pi.
+    hash_path = quantized_output_path + ".sha256"
+    old_hash = None
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            old_hash = f.read().strip()
+    elif os.path.exists(quantized_output_path):
+        # No sidecar yet: hash the raw pixel bytes straight off the mmap'd
+        # BMP, falling back to a decode only for unexpected formats.
+        raw = bmp_raw_bytes(quantized_output_path)
+        if raw is None:
+            raw = open_rgb(quantized_output_path).tobytes()
+        old_hash = hashlib.sha256(raw).hexdigest()
+
+    # The raw composed image is debug material only — nothing downstream
+    # reads it — so skip the ~1.1 MB write unless keep_raw asks for it.
+    if config.get("keep_raw", False):
+        save_bmp_topdown(final_img, output_path)
+        print(f"Saved final weather image to {output_path}")
+
+    # Quantize in memory from the image just composed — no BMP re-decode.
     more_colors = config.get('more_colors', False)
-    quantize_to_seven_colors(output_path, quantized_output_path, more_colors, threshold=75)
-    new_quant = Image.open(quantized_output_path).convert("RGB")
-    if old_quant is not None and images_are_equal(old_quant, new_quant):
+    new_quant = quantize_image(final_img, more_colors,
+                               threshold=75, dither=config.get('dither', False))
+    save_bmp_topdown(new_quant, quantized_output_path)
+    print(f"Quantized image saved to {quantized_output_path}")
+    new_hash = hashlib.sha256(new_quant.tobytes()).hexdigest()
+    with open(hash_path, "w") as f:
+        f.write(new_hash)
+    # Percentage comes straight off the in-memory raster — callers used to
+    # re-open the file they were just handed to measure it.
+    pct = estimate_interest(new_quant)
+    if old_hash == new_hash:
         print(f"Station {station}: Quantized image unchanged.")
-        return None, False
-    return quantized_output_path, True
+        return None, False, pct
+    return quantized_output_path, True, pct
 
 def calculate_non_bw_percentage(image_path):
     """
     Calculate the percentage of pixels that are not pure black or white.
     """
-    image = Image.open(image_path).convert("RGB")
-    pixels = list(image.getdata())
-    if not pixels:
+    image = open_rgb(image_path)
+    arr = np.frombuffer(image.tobytes(), dtype=np.uint8).reshape(-1, 3)
+    if arr.size == 0:
         return 0.0
-    non_bw_count = sum(1 for pixel in pixels if pixel not in [(0, 0, 0), (255, 255, 255)])
-    return (non_bw_count / len(pixels)) * 100
+    non_bw_count = np.count_nonzero((arr != 0).any(axis=1) & (arr != 255).any(axis=1))
+    return (non_bw_count / len(arr)) * 100
+
+def estimate_interest(radar_img):
+    """
+    Cheap ranking proxy: percentage of pixels that are neither pure black
+    nor pure white in the raw radar frame. Precipitation colors are the
+    same non-BW pixels the quantizer would count, so the ranking matches
+    the full resize+quantize measurement without paying for it.
+    """
+    arr = np.asarray(radar_img).reshape(-1, 3)
+    if arr.size == 0:
+        return 0.0
+    non_bw = np.count_nonzero((arr != 0).any(axis=1) & (arr != 255).any(axis=1))
+    return (non_bw / len(arr)) * 100
 
 def full_station_scan(config):
     """
     Perform a full scan over all stations from config.
-    Returns a dictionary mapping station -> interesting pixel percentage.
+    Returns a dictionary mapping station -> interesting pixel percentage,
+    estimated directly on the fetched radar frames; the expensive
+    resize/quantize pipeline only runs later for the stations that win.
     """
     percentages = {}
-    special_msg = get_special_weather_messages()
-    for station_data in config.get("stations", []):
+    stations = [s for s in config.get("stations", []) if s.get("name")]
+
+    # Overlap the independent radar downloads; estimation is cheap enough
+    # to stay serial.
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        fetched = dict(zip(
+            (s["name"] for s in stations),
+            pool.map(lambda s: fetch_radar_bytes(s["name"])[0], stations)))
+
+    for station_data in stations:
         station = station_data.get("name")
-        if not station:
-            continue
-        config["station"] = station_data
-        config["output_path"] = os.path.join("radar", f"eink_display_{station}.bmp")
-        config["quantized_path"] = os.path.join("radar", f"eink_quantized_display_{station}.bmp")
-        result = generate_weather_image(config, special_msg=special_msg)
-        if result is None:
+        radar_bytes = fetched.get(station)
+        if radar_bytes is None:
             print(f"Skipping processing for station {station} due to image fetch failure.")
             continue
-        perc = calculate_non_bw_percentage(config["quantized_path"])
+        radar_img = Image.open(io.BytesIO(radar_bytes)).convert("RGB")
+        perc = estimate_interest(radar_img)
         percentages[station] = perc
         print(f"Full scan: Station {station} -> {perc:.2f}% interesting pixels")
     return percentages
@@ -364,11 +661,12 @@ def main():
     default_station = config.get("station", {}).get("name", "KTYX")
     config["output_path"] = os.path.join(radar_folder, f"eink_display_{default_station}.bmp")
     config["quantized_path"] = os.path.join(radar_folder, f"eink_quantized_display_{default_station}.bmp")
-    default_image_path, default_updated = generate_weather_image(config, special_msg=special_msg)
+    default_image_path, default_updated, default_percentage = generate_weather_image(config, special_msg=special_msg)
     if default_image_path is None and not default_updated:
         print(f"Default station {default_station}: No changes detected. Keeping current display.")
         default_image_path = config["quantized_path"]
-    default_percentage = calculate_non_bw_percentage(config["quantized_path"])
+    if default_percentage is None:
+        default_percentage = calculate_non_bw_percentage(config["quantized_path"])
     print(f"Default station ({default_station}) has {default_percentage:.2f}% interesting pixels.")
     should_update = default_updated  # Use a flag to indicate if an update occurred
     final_display_image = default_image_path
@@ -389,12 +687,13 @@ def main():
             config["quantized_path"] = os.path.join(radar_folder, f"eink_quantized_display_{station}.bmp")
             station_entry = next((s for s in config.get("stations", []) if s["name"] == station), {})
             config['station']['location'] = station_entry.get("location", "Unknown Location")
-            image_path, updated = generate_weather_image(config, special_msg=special_msg)
+            image_path, updated, perc = generate_weather_image(config, special_msg=special_msg)
             if image_path is None:
                 print(f"Skipping processing for station {station} due to image fetch failure.")
                 continue
             should_update = True
-            perc = calculate_non_bw_percentage(config["quantized_path"])
+            if perc is None:
+                perc = calculate_non_bw_percentage(config["quantized_path"])
             if perc > best_percentage:
                 best_percentage = perc
                 best_station = station
@@ -442,7 +741,11 @@ def main():
         else:
             print(f"Skipping display update on non-Raspberry Pi system: {platform.system()}")
 
-        if config.get('interesting_station', False) and now - state.get("last_full_scan", 0) >= full_scan_interval:
+        # Inline refresh only when no external scan_stations.py job is
+        # scheduled (external_scan: true); the scan itself lives there.
+        if (config.get('interesting_station', False)
+                and not config.get('external_scan', False)
+                and now - state.get("last_full_scan", 0) >= full_scan_interval):
             state["last_full_scan"] = now
             save_state(STATE_FILE, state)
             print("Running full station refresh...")
@@ -455,4 +758,18 @@ def main():
         print("No image changes detected; display update skipped.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # One-shot by default so cron setups keep working. With daemon: true
+    # the process stays alive and re-runs every radar tick, amortizing
+    # interpreter startup and the PIL/NumPy imports (~400 ms on a Pi) that
+    # otherwise dominate the no-update fast path.
+    _config = load_config('config.yml')
+    if _config.get('daemon', False):
+        interval = _config.get('daemon_interval', 300)  # NWS radar cadence
+        while True:
+            try:
+                main()
+            except Exception as e:
+                print(f"Error during radar update: {e}")
+            time.sleep(interval)
+    else:
+        main()
\ No newline at end of file